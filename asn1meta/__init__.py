@@ -1 +1,9 @@
 from .parser import parse_files
+
+
+def __getattr__(name):
+  # The table view pulls in `dataclasses`; only import it when it is used.
+  if name in ("MetaTable", "build_meta_table"):
+    from . import table
+    return getattr(table, name)
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
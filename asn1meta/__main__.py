@@ -0,0 +1,23 @@
+from argparse import ArgumentParser
+from glob import glob
+from json import dumps
+
+from .parser import parse_files
+
+
+def main() -> None:
+  """
+  Parse the ASN.1 files matching a glob pattern and print their metadata as JSON.
+  """
+  parser = ArgumentParser(prog="python -m asn1meta")
+  parser.add_argument("file_pattern", type=str)
+  parser.add_argument("-j", "--workers", type=int, default=1, help="parser processes (0 for one per CPU)")
+  parser.add_argument("--cache-dir", type=str, default=None, help="reuse parse results stored in this directory")
+  args = parser.parse_args()
+
+  metadata_dict = parse_files(glob(args.file_pattern), workers=args.workers or None, cache_dir=args.cache_dir)
+  print(dumps(metadata_dict, indent=2))
+
+
+if __name__ == "__main__":
+  main()
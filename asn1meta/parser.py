@@ -1,103 +1,304 @@
+from __future__ import annotations
+
+import mmap
+import os
 import re
-from typing import Dict, Tuple, List, Iterator, Optional, Any
+import stat
+import sys
+from collections import defaultdict
+
+# Type-only imports: annotations are never evaluated at runtime, so `import asn1meta`
+# does not pay for `typing` (checkers treat TYPE_CHECKING as true).
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+  from typing import Dict, Tuple, List, Iterable, Iterator, Optional, Union, Any
+
+  # (absolute path, mtime_ns, size) of a parsed file.
+  FileKey = Tuple[str, int, int]
+
+  # Anything the byte patterns can scan in place, e.g. the `mmap` in `process_file`.
+  BytesLike = Union[bytes, bytearray, mmap.mmap]
 
 # Overall nested dictionary:
 # Module -> Type -> Field -> { "field": { "type": ..., "restrict-to": ... }, "meta": { ... } }
-ModuleDict = Dict[str, Dict[str, Dict[str, Dict[str, Any]]]]
+# At runtime the alias is kept as its string form, so it stays importable without `typing`.
+if TYPE_CHECKING:
+  ModuleDict = Dict[str, Dict[str, Dict[str, Dict[str, Any]]]]
+else:
+  ModuleDict = "Dict[str, Dict[str, Dict[str, Dict[str, Any]]]]"
+
+# Patterns are compiled once at import time; the helpers below run once per line.
+# A field line is matched in two steps: name and type first, then (for INTEGER
+# only) the size constraint directly following the type.
+_FIELD_RE = re.compile(r"^([\w-]+)\s+([\w-]+)")
+_FIELD_RANGE_RE = re.compile(r"\s*\(([-0-9]+)\.\.([-0-9]+)\)")
+_META_KV_RE = re.compile(r"--\s*\[(.+)\]\s+(.*)")
+
+# Byte patterns for scanning a whole file buffer in one pass. Each structural line
+# is matched in full (including its newline) so the scan can resume at `m.end()`;
+# the group that matched (`m.lastgroup`) tells the caller what kind of line it is.
+# Surrounding whitespace (and the "\r" of CRLF files) is consumed by the patterns
+# instead of `str.strip`, and only the captured groups are ever decoded.
+_LINE_RE = re.compile(
+  rb"^[ \t]*(?:"
+  rb"(?P<module>[\w-]+)[ \t]+DEFINITIONS"
+  rb"|(?P<type>[\w-]+)[ \t]*::=[ \t]*SEQUENCE[ \t]*{"
+  rb"|(?P<end>})[ \t\r]*$"
+  rb"|(?P<meta>-- \[Meta\])"
+  rb").*\n?",
+  re.MULTILINE,
+)
+# Line bodies are captured greedily up to their last non-blank character: a lazy
+# `.*?` would retry the trailing-whitespace tail at every position (quadratic on
+# long lines), whereas this backtracks at most once per line.
+# `_META_BLOCK_RE` consumes everything after a "-- [Meta]" line in one match: the
+# run of "-- [" lines (group 1) and the field definition line after it (group 2).
+# `_META_ITEM_RE` then picks the "-- [Key] value" items (the shape `_META_KV_RE`
+# accepts) out of group 1's span.
+_META_BLOCK_RE = re.compile(
+  rb"((?:[ \t]*-- \[.*(?:\n|\Z))*)"
+  rb"[ \t]*((?:.*[^ \t\r\n])?)[ \t\r]*$\n?",
+  re.MULTILINE,
+)
+_META_ITEM_RE = re.compile(rb"^[ \t]*-- \[(.+)\][ \t]+(.*[^ \t\r\n])", re.MULTILINE)
+
+# Parsed files, keyed by absolute path, with the (path, mtime_ns, size) key they were parsed at.
+_file_cache: Dict[str, Tuple[FileKey, ModuleDict]] = {}
 
-def parse_files(asn_files: List[str]) -> ModuleDict:
+# Bumped whenever the parser output changes, invalidating on-disk cache entries.
+_CACHE_VERSION = 1
+
+def parse_files(
+  asn_files: Iterable[str], workers: Optional[int] = 1, cache_dir: Optional[str] = None, cache: bool = False
+) -> ModuleDict:
   """
   Process all ASN.1 files and merge the metadata dictionaries.
+  With `workers` other than 1, files are parsed in that many processes
+  (None uses one per CPU); files are still merged in the given order.
+  With `cache`, files unchanged (same mtime and size) since a previous `cache=True`
+  call in this process are not parsed again; the returned dictionaries then share
+  data with the cache and must be treated as read-only.
+  With `cache_dir`, parse results are also pickled there and reused across
+  processes (e.g. repeated CLI runs); only point it at a directory you trust.
+  """
+  filenames = list(asn_files)
+  file_datas: List[Optional[ModuleDict]] = [None] * len(filenames)
+  keys: List[FileKey] = []
+  if cache or cache_dir is not None:
+    keys = [file_cache_key(filename) for filename in filenames]
+    for i, key in enumerate(keys):
+      entry = _file_cache.get(key[0]) if cache else None
+      if entry is not None and entry[0] == key:
+        file_datas[i] = entry[1]
+      elif cache_dir is not None:
+        cached = _load_cached_file(cache_dir, key)
+        if cached is not None:
+          file_datas[i] = cached
+          if cache:
+            _file_cache[key[0]] = (key, cached)
+
+  stale = [i for i, file_data in enumerate(file_datas) if file_data is None]
+  for i, file_data in zip(stale, _process_files([filenames[i] for i in stale], workers)):
+    file_datas[i] = file_data
+    if cache:
+      _file_cache[keys[i][0]] = (keys[i], file_data)
+    if cache_dir is not None:
+      _store_cached_file(cache_dir, keys[i], file_data)
+  return merge_file_data([file_data for file_data in file_datas if file_data is not None])
+
+def _process_files(filenames: List[str], workers: Optional[int]) -> List[ModuleDict]:
+  """
+  Run `process_file` over `filenames`, in a process pool unless `workers` is 1.
+  """
+  if workers == 1 or len(filenames) < 2:
+    return list(map(process_file, filenames))
+
+  from concurrent.futures import ProcessPoolExecutor
+
+  n_workers = workers or os.cpu_count() or 1
+  chunksize = max(1, len(filenames) // (4 * n_workers))
+  with ProcessPoolExecutor(max_workers=n_workers) as executor:
+    return list(executor.map(process_file, filenames, chunksize=chunksize))
+
+def file_cache_key(filename: str) -> FileKey:
+  """
+  Return the (absolute path, mtime_ns, size) key `parse_files` caches a file under.
+  """
+  st = os.stat(filename)
+  return os.path.abspath(filename), st.st_mtime_ns, st.st_size
+
+def clear_file_cache() -> None:
+  """
+  Forget all files cached by `parse_files(..., cache=True)`.
+  """
+  _file_cache.clear()
+
+def _cached_file_path(cache_dir: str, key: FileKey) -> str:
+  from hashlib import sha1
+
+  return os.path.join(cache_dir, sha1(key[0].encode("utf-8")).hexdigest() + ".pkl")
+
+def _load_cached_file(cache_dir: str, key: FileKey) -> Optional[ModuleDict]:
+  """
+  Load a file's parse result from `cache_dir`.
+  Returns None if there is no usable entry for exactly this key.
+  """
+  import pickle
+
+  try:
+    with open(_cached_file_path(cache_dir, key), "rb") as f:
+      version, cached_key, file_data = pickle.load(f)
+  except Exception:
+    return None  # Missing, corrupt or foreign entries are all cache misses.
+  if version != _CACHE_VERSION or cached_key != key:
+    return None
+  return file_data
+
+def _store_cached_file(cache_dir: str, key: FileKey, file_data: ModuleDict) -> None:
+  """
+  Write a file's parse result to `cache_dir`; the cache is best-effort, so I/O errors are ignored.
   """
-  overall_data: ModuleDict = {}
-  for filename in asn_files:
-    file_data = process_file(filename)
+  import pickle
+
+  path = _cached_file_path(cache_dir, key)
+  tmp_path = f"{path}.{os.getpid()}.tmp"
+  try:
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(tmp_path, "wb") as f:
+      pickle.dump((_CACHE_VERSION, key, file_data), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+  except OSError:
+    pass
+
+def merge_file_data(file_datas: Iterable[ModuleDict]) -> ModuleDict:
+  """
+  Merge per-file metadata dictionaries; later files win for duplicate types.
+  """
+  overall_data: ModuleDict = defaultdict(dict)
+  for file_data in file_datas:
     for mod, types in file_data.items():
-      overall_data.setdefault(mod, {}).update(types)
-  return overall_data
+      overall_data[mod].update(types)
+  return dict(overall_data)
 
 def process_file(filename: str) -> ModuleDict:
   """
   Process a single ASN.1 file and return a nested dictionary of metadata.
   """
-  with open(filename, "r") as f:
-    lines = f.readlines()
-
-  entries = list(iter_entries_from_lines(lines))
-  data: ModuleDict = {}
+  with open(filename, "rb") as f:
+    st = os.fstat(f.fileno())
+    if st.st_size == 0 or not stat.S_ISREG(st.st_mode):
+      # Only non-empty regular files can be memory-mapped; read pipes etc. instead.
+      entries = list(iter_entries_from_buffer(f.read()))
+    else:
+      with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        entries = list(iter_entries_from_buffer(buf))
+  data: ModuleDict = defaultdict(lambda: defaultdict(dict))
   for module, typ, field, entry in entries:
-    data.setdefault(module, {}).setdefault(typ, {})[field] = entry
-  return data
+    data[module][typ][field] = entry
+  return {module: dict(types) for module, types in data.items()}
 
 
 def iter_entries_from_lines(lines: List[str]) -> Iterator[Tuple[str, str, str, Dict[str, Any]]]:
   """
-  Given the lines from an ASN.1 file, yield tuples of
+  Given the lines from an ASN.1 file, yield the same tuples as `iter_entries_from_text`.
+  """
+  return iter_entries_from_text("\n".join(line.rstrip("\r\n") for line in lines))
+
+
+def iter_entries_from_text(text: str) -> Iterator[Tuple[str, str, str, Dict[str, Any]]]:
+  """
+  Given the contents of an ASN.1 file, yield the same tuples as `iter_entries_from_buffer`.
+  """
+  return iter_entries_from_buffer(text.encode("utf-8"))
+
+
+def iter_entries_from_buffer(buf: BytesLike) -> Iterator[Tuple[str, str, str, Dict[str, Any]]]:
+  """
+  Given the raw (UTF-8) contents of an ASN.1 file as any bytes-like object, e.g. an
+  `mmap`, yield tuples of
      (module, type, field, { "field": {...}, "meta": {...} })
-  using an iterator-based style.
+  scanning the buffer once with `_LINE_RE` rather than splitting it into lines.
+  Module, type and field-type names are interned so repeated names share one string.
   """
+  # Entries only come from meta blocks; a substring search (C-level) is far
+  # cheaper than running the line scanner over a file that has none.
+  if buf.find(b"-- [Meta]") == -1:
+    return
+
   current_module = "UnknownModule"
   current_type = "UnknownType"
   in_sequence = False
 
-  line_iter = iter(lines)
-  for raw_line in line_iter:
-    line = raw_line.strip()
-    if not line:
-      continue
+  search_line = _LINE_RE.search
+  match_meta_block = _META_BLOCK_RE.match
+  iter_meta_items = _META_ITEM_RE.finditer
+  get_meta_parser = _META_PARSERS.get
+  match_field = _FIELD_RE.match
+  match_field_range = _FIELD_RANGE_RE.match
+  pos = 0
+  while (m := search_line(buf, pos)) is not None:
+    pos = m.end()
+    kind = m.lastgroup
 
-    if (module_name := parse_module_line(line)) is not None:
-      current_module = module_name
+    if kind == "module":
+      current_module = sys.intern(m.group("module").decode("utf-8"))
       continue
 
-    if (type_name := parse_type_line(line)) is not None:
-      current_type = type_name
+    if kind == "type":
+      current_type = sys.intern(m.group("type").decode("utf-8"))
       in_sequence = True
       continue
 
-    if in_sequence and line == "}":
+    if not in_sequence:
+      continue
+
+    if kind == "end":
       in_sequence = False
       current_type = "UnknownType"
       continue
 
-    if in_sequence and line.startswith("-- [Meta]"):
-      meta_lines: List[str] = []
-      for candidate in line_iter:
-        candidate = candidate.strip()
-        if candidate.startswith("-- ["):
-          meta_lines.append(candidate)
-        else:
-          field_line = candidate
-          break
-      else:
-        continue  # No field definition found.
-
-      meta = parse_generic_meta_block(meta_lines)
+    if kind == "meta":
+      # The meta block runs until the first line not starting with "-- [",
+      # which is taken as the field definition. Items are parsed as
+      # `parse_generic_meta_block` would.
+      block_m = match_meta_block(buf, pos)
+      assert block_m is not None  # Group 2 may match an empty line, so this always matches.
+      items_end = block_m.end(1)
+      if items_end >= len(buf):
+        break  # No field definition found.
+      pos = block_m.end()
+
+      meta: Dict[str, Any] = {}
+      for item_m in iter_meta_items(buf, block_m.start(1), items_end):
+        key = sys.intern(item_m.group(1).decode("utf-8"))
+        meta[key] = get_meta_parser(key, parse_meta_value)(item_m.group(2).decode("utf-8"))
       if not meta:
         continue
+      field_line = block_m.group(2).decode("utf-8")
 
-      field_parsed = parse_field_line(field_line)
-      if field_parsed is None:
+      # Same as `parse_field_line`, inlined to use the match object directly.
+      field_m = match_field(field_line)
+      if field_m is None:
         continue
-      field_name, field_type, integer_restrict_to = field_parsed
+      field_type = sys.intern(field_m.group(2))
       field_info: Dict[str, Any] = {"type": field_type}
-      if field_type == "INTEGER" and integer_restrict_to is not None:
-        field_info["restrict-to"] = integer_restrict_to
-      yield (current_module, current_type, field_name, {"field": field_info, "meta": meta})
+      if field_type == "INTEGER" and (range_m := match_field_range(field_line, field_m.end())) is not None:
+        field_info["restrict-to"] = (int(range_m.group(1)), int(range_m.group(2)))
+      yield (current_module, current_type, field_m.group(1), {"field": field_info, "meta": meta})
   return
 
 
 
 def parse_module_line(line: str) -> Optional[str]:
-  """Extract the module name from a module definition line."""
-  m = re.match(r"^([\w-]+)\s+DEFINITIONS", line)
-  return m.group(1) if m else None
+  """Extract the module name from a module definition line (same grammar as `_LINE_RE`)."""
+  m = _LINE_RE.match(line.encode("utf-8"))
+  return m.group("module").decode("utf-8") if m and m.lastgroup == "module" else None
 
 
 def parse_type_line(line: str) -> Optional[str]:
-  """Extract the type name from a SEQUENCE type definition line."""
-  m = re.match(r"^([\w-]+)\s*::=\s*SEQUENCE\s*{", line)
-  return m.group(1) if m else None
+  """Extract the type name from a SEQUENCE type definition line (same grammar as `_LINE_RE`)."""
+  m = _LINE_RE.match(line.encode("utf-8"))
+  return m.group("type").decode("utf-8") if m and m.lastgroup == "type" else None
 
 
 def parse_meta_value(val: str) -> Any:
@@ -124,6 +325,35 @@ def parse_meta_value(val: str) -> Any:
       return val
 
 
+def _parse_scale_value(val: str) -> Any:
+  """Fast path for `[Scale]`: a plain float, otherwise `parse_meta_value`."""
+  try:
+    return float(val)
+  except ValueError:
+    return parse_meta_value(val)
+
+
+def _parse_range_value(val: str) -> Any:
+  """Fast path for `[Range]`: a `(min, max)` float pair, otherwise `parse_meta_value`."""
+  val = val.strip()
+  if val[:1] == "(" and val[-1:] == ")":
+    low, sep, high = val[1:-1].partition(",")
+    if sep and "," not in high:
+      try:
+        return (float(low), float(high))
+      except ValueError:
+        pass
+  return parse_meta_value(val)
+
+
+# Specialized value parsers for the most common meta keys; any other key (and any
+# value the fast path does not recognise) goes through `parse_meta_value`.
+_META_PARSERS = {
+  "Scale": _parse_scale_value,
+  "Range": _parse_range_value,
+}
+
+
 def parse_generic_meta_block(meta_lines: List[str]) -> Dict[str, Any]:
   """
   Parse a list of meta lines.
@@ -134,15 +364,18 @@ def parse_generic_meta_block(meta_lines: List[str]) -> Dict[str, Any]:
      -- [Range] (-12.8, 12.7)
      -- [Description] 'Ascent rate'
      -- [Units] 'm/s'
-  Keys are used as provided and values are parsed via `parse_meta_value`.
+  Keys are used as provided (interned, as the same few repeat for every field)
+  and values are parsed via `parse_meta_value`.
   """
   meta: Dict[str, Any] = {}
+  match_kv = _META_KV_RE.match
+  get_parser = _META_PARSERS.get
   for line in meta_lines:
-    m = re.match(r"--\s*\[(.+)\]\s+(.*)", line)
+    m = match_kv(line)
     if m:
-      key = m.group(1)
+      key = sys.intern(m.group(1))
       value_str = m.group(2)
-      meta[key] = parse_meta_value(value_str)
+      meta[key] = get_parser(key, parse_meta_value)(value_str)
   return meta
 
 
@@ -156,26 +389,19 @@ def parse_field_line(line: str) -> Optional[Tuple[str, str, Optional[Tuple[int,
      (field_name, field_type, integer_restrict_to)
   where integer_restrict_to is only provided if field_type is "INTEGER" and a restriction is given.
   """
-  m = re.match(r"^([\w-]+)\s+([\w-]+)(?:\s*\(([-0-9]+)\.\.([-0-9]+)\))?,?", line)
+  m = _FIELD_RE.match(line)
   if m is None:
     return None
   field_name = m.group(1)
   field_type = m.group(2)
   integer_restrict_to: Optional[Tuple[int, int]] = None
-  if field_type == "INTEGER" and m.group(3) and m.group(4):
-    integer_restrict_to = (int(m.group(3)), int(m.group(4)))
+  if field_type == "INTEGER" and (range_m := _FIELD_RANGE_RE.match(line, m.end())) is not None:
+    integer_restrict_to = (int(range_m.group(1)), int(range_m.group(2)))
   return field_name, field_type, integer_restrict_to
 
 
-# Example usage:
+# Example usage (the CLI lives in `asn1meta/__main__.py`, run as `python -m asn1meta`):
 if __name__ == "__main__":
-  from argparse import ArgumentParser
-  from glob import glob
-  from json import dumps
-
-  parser = ArgumentParser()
-  parser.add_argument("file_pattern", type=str)
-  args = parser.parse_args()
+  from asn1meta.__main__ import main
 
-  metadata_dict = parse_files(glob(args.file_pattern))
-  print(dumps(metadata_dict, indent=2))
+  main()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+  from typing import Any, Dict, List, Tuple
+
+  from .parser import ModuleDict
+
+_NAN = float("nan")
+
+
+@dataclass
+class MetaTable:
+  """
+  Struct-of-arrays view of a `ModuleDict`: row `i` describes field
+  `fields[i]` of type `types[i]` in module `modules[i]`.
+  The numeric columns are contiguous `array('d')` buffers (NaN where a field has
+  no numeric value) holding 8 bytes per value instead of a boxed float or tuple
+  per field, and they can be wrapped without copying, e.g.
+  `numpy.frombuffer(table.scales)`, and used for vectorized scaling.
+  """
+  modules: List[str] = field(default_factory=list)
+  types: List[str] = field(default_factory=list)
+  fields: List[str] = field(default_factory=list)
+  scales: array = field(default_factory=lambda: array("d"))
+  range_min: array = field(default_factory=lambda: array("d"))
+  range_max: array = field(default_factory=lambda: array("d"))
+  restrict_min: array = field(default_factory=lambda: array("d"))
+  restrict_max: array = field(default_factory=lambda: array("d"))
+  index: Dict[Tuple[str, str, str], int] = field(default_factory=dict)
+
+  def __len__(self) -> int:
+    return len(self.fields)
+
+  def lookup(self, module: str, typ: str, field_name: str) -> int:
+    """
+    Return the row of a field; raises KeyError if it is not in the table.
+    """
+    return self.index[(module, typ, field_name)]
+
+
+def _as_float(value: Any) -> float:
+  return float(value) if isinstance(value, (int, float)) else _NAN
+
+
+def build_meta_table(data: ModuleDict) -> MetaTable:
+  """
+  Flatten the nested dictionary returned by `parse_files` into a `MetaTable`.
+  The `Scale` meta value fills `scales`; a two-element `Range` fills `range_min`/`range_max`
+  and an INTEGER `restrict-to` constraint fills `restrict_min`/`restrict_max`
+  (exact for bounds up to 2**53 in magnitude).
+  """
+  table = MetaTable()
+  for module, types in data.items():
+    for typ, fields in types.items():
+      for field_name, entry in fields.items():
+        meta = entry["meta"]
+        table.index[(module, typ, field_name)] = len(table.fields)
+        table.modules.append(module)
+        table.types.append(typ)
+        table.fields.append(field_name)
+        table.scales.append(_as_float(meta.get("Scale")))
+        value_range = meta.get("Range")
+        if isinstance(value_range, tuple) and len(value_range) == 2:
+          table.range_min.append(_as_float(value_range[0]))
+          table.range_max.append(_as_float(value_range[1]))
+        else:
+          table.range_min.append(_NAN)
+          table.range_max.append(_NAN)
+        restrict_to = entry["field"].get("restrict-to")
+        if restrict_to is not None:
+          table.restrict_min.append(restrict_to[0])
+          table.restrict_max.append(restrict_to[1])
+        else:
+          table.restrict_min.append(_NAN)
+          table.restrict_max.append(_NAN)
+  return table
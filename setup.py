@@ -1,9 +1,24 @@
+import os
+
 from setuptools import setup, find_packages
 
+# Set ASN1META_CYTHON=1 to compile the parser with Cython (pure Python fallback otherwise).
+ext_modules = []
+if os.environ.get("ASN1META_CYTHON"):
+    try:
+        from Cython.Build import cythonize
+    except ImportError:
+        raise SystemExit(
+            "ASN1META_CYTHON is set but Cython is not installed; run `pip install cython` and "
+            "build with `pip install --no-build-isolation .`"
+        )
+    ext_modules = cythonize("asn1meta/parser.py", language_level=3)
+
 setup(
     name="asn1meta",
     version="0.1.0",
     packages=find_packages(),
+    ext_modules=ext_modules,
     description="A package that allows you to define metadata for ANS.1 types",
     long_description=open("readme.md", encoding="utf-8").read(),
     long_description_content_type="text/markdown",